@@ -3,90 +3,79 @@
 Web interface for Post-Mortem Generator
 """
 
-from flask import Flask, render_template_string, request, jsonify
-from generate_postmortem import generate_postmortem
-from datetime import datetime
+import gzip
+import hashlib
+import os
+import re
+from operator import itemgetter
+
+import brotli
+import fastjsonschema
+import orjson
+from flask import Flask, Response, abort, request, jsonify
+from flask_compress import Compress
+from werkzeug.exceptions import RequestEntityTooLarge
+from generate_postmortem import generate_postmortem, iter_postmortem
 
 app = Flask(__name__)
 
+# Upper bounds on user text, checked before any formatting work is done
+_MAX_FIELD = 64 * 1024
+_MAX_LINES = 500
+
+# Worst-case JSON size of one character: an escaped surrogate pair, "\ud83d\ude00"
+_JSON_BYTES_PER_CHAR = 12
+
+# Reject oversized bodies before they are read. Sized so the four long text
+# fields at _MAX_FIELD characters, plus the short capped fields and the JSON
+# punctuation, fit even when every character is escaped.
+app.config["MAX_CONTENT_LENGTH"] = 4 * _MAX_FIELD * _JSON_BYTES_PER_CHAR + 16 * 1024
+# Asset URLs carry a content hash (see _static_url), so they can be cached forever
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+# Streamed responses (/generate.md and static files) need gzip listed separately
+app.config["COMPRESS_ALGORITHM_STREAMING"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_MIMETYPES"] = [
+    "text/html",
+    "text/css",
+    "text/javascript",
+    # Python before 3.12 maps .js here unless the system mime.types says otherwise
+    "application/javascript",
+    "text/markdown",
+    "application/json",
+]
+Compress(app)
+
+# Each match is one non-blank line with surrounding whitespace stripped, the
+# same as str.strip() per line. No part of the pattern can cross a newline and
+# the only backtracking is over one line's trailing whitespace, so it is linear.
+_LINE_RE = re.compile(r"^[^\S\n]*(\S(?:[^\n]*\S)?)", re.MULTILINE)
+
+# Shape of the form's JSON payload, compiled once into a validator function
+_VALIDATE = fastjsonschema.compile({
+    "type": "object",
+    "required": ["incident", "date", "duration", "impact", "rootCause"],
+    "properties": {
+        "incident": {"type": "string", "maxLength": 200},
+        "date": {"type": "string", "maxLength": 64},
+        "duration": {"type": "string", "maxLength": 200},
+        "impact": {"type": "string"},
+        "rootCause": {"type": "string"},
+        "timeline": {"type": ["string", "null"]},
+        "resolution": {"type": ["string", "null"]},
+    },
+})
+
+# Required form fields, fetched in one call once _VALIDATE has checked them
+_REQUIRED_FIELDS = itemgetter("incident", "date", "duration", "impact", "rootCause")
+
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>Post-Mortem Generator</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            max-width: 1000px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #f5f5f5;
-        }
-        .container {
-            background: white;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        h1 {
-            color: #333;
-            margin-bottom: 30px;
-        }
-        .form-group {
-            margin-bottom: 20px;
-        }
-        label {
-            display: block;
-            margin-bottom: 8px;
-            font-weight: 600;
-            color: #555;
-        }
-        input[type="text"], input[type="date"], textarea {
-            width: 100%;
-            padding: 10px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            font-size: 14px;
-            box-sizing: border-box;
-        }
-        textarea {
-            min-height: 100px;
-            font-family: inherit;
-        }
-        button {
-            background: #007bff;
-            color: white;
-            padding: 12px 24px;
-            border: none;
-            border-radius: 4px;
-            font-size: 16px;
-            cursor: pointer;
-            margin-right: 10px;
-        }
-        button:hover {
-            background: #0056b3;
-        }
-        .preview {
-            margin-top: 30px;
-            padding: 20px;
-            background: #f8f9fa;
-            border-radius: 4px;
-            border: 1px solid #ddd;
-        }
-        .preview pre {
-            white-space: pre-wrap;
-            word-wrap: break-word;
-            font-family: 'Courier New', monospace;
-            font-size: 12px;
-            line-height: 1.6;
-        }
-        .download-btn {
-            background: #28a745;
-        }
-        .download-btn:hover {
-            background: #218838;
-        }
-    </style>
+    <link rel="stylesheet" href="{css_url}">
 </head>
 <body>
     <div class="container">
@@ -138,101 +127,146 @@ HTML_TEMPLATE = """
         </div>
     </div>
     
-    <script>
-        // Set today's date as default
-        document.getElementById('date').valueAsDate = new Date();
-        
-        let currentPostmortem = '';
-        
-        document.getElementById('postmortemForm').addEventListener('submit', async (e) => {
-            e.preventDefault();
-            
-            const formData = {
-                incident: document.getElementById('incident').value,
-                date: document.getElementById('date').value,
-                duration: document.getElementById('duration').value,
-                impact: document.getElementById('impact').value,
-                rootCause: document.getElementById('rootCause').value,
-                timeline: document.getElementById('timeline').value,
-                resolution: document.getElementById('resolution').value
-            };
-            
-            try {
-                const response = await fetch('/generate', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(formData)
-                });
-                
-                const data = await response.json();
-                
-                if (data.error) {
-                    alert('Error: ' + data.error);
-                } else {
-                    currentPostmortem = data.postmortem;
-                    document.getElementById('previewContent').textContent = data.postmortem;
-                    document.getElementById('preview').style.display = 'block';
-                    document.getElementById('downloadBtn').style.display = 'inline-block';
-                }
-            } catch (err) {
-                alert('Error: ' + err.message);
-            }
-        });
-        
-        document.getElementById('downloadBtn').addEventListener('click', () => {
-            if (!currentPostmortem) return;
-            
-            const blob = new Blob([currentPostmortem], { type: 'text/markdown' });
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = `postmortem_${document.getElementById('date').value}_${document.getElementById('incident').value.toLowerCase().replace(/ /g, '_')}.md`;
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            URL.revokeObjectURL(url);
-        });
-    </script>
+    <script src="{js_url}"></script>
 </body>
 </html>
 """
 
+
+def _static_url(filename):
+    """URL for a file in static/, versioned by a hash of its contents."""
+    with open(os.path.join(app.static_folder, filename), "rb") as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    return f"{app.static_url_path}/{filename}?v={digest}"
+
+
+# The page only varies with the asset hashes, so fill them in and encode it
+# once at import time and serve the same bytes on every request.
+_INDEX_BYTES = HTML_TEMPLATE.format(
+    css_url=_static_url("app.css"),
+    js_url=_static_url("app.js"),
+).encode("utf-8")
+_INDEX_ETAG = hashlib.md5(_INDEX_BYTES).hexdigest()
+
+# The body is constant, so compress it once per encoding here instead of on
+# every request. Responses that already carry Content-Encoding are passed
+# through by Flask-Compress; the ETag suffixes follow its "<etag>:<encoding>"
+# convention. Maps encoding (None for identity) to body, length and ETag.
+_INDEX_VARIANTS = {}
+for _encoding, _body in (
+    (None, _INDEX_BYTES),
+    ("br", brotli.compress(_INDEX_BYTES, quality=11)),
+    ("gzip", gzip.compress(_INDEX_BYTES, compresslevel=9, mtime=0)),
+):
+    _INDEX_VARIANTS[_encoding] = (
+        _body,
+        str(len(_body)),
+        f"{_INDEX_ETAG}:{_encoding}" if _encoding else _INDEX_ETAG,
+    )
+
+
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    encoding = request.accept_encodings.best_match(["br", "gzip"])
+    body, length, etag = _INDEX_VARIANTS[encoding]
+    response = Response(
+        body,
+        mimetype="text/html",
+        headers={
+            "Content-Length": length,
+            "Cache-Control": "public, max-age=3600",
+            "Vary": "Accept-Encoding",
+        },
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def _postmortem_kwargs(data):
+    """Map the form's JSON payload onto generate_postmortem arguments."""
+    incident, date, duration, impact, root_cause = _REQUIRED_FIELDS(data)
+    
+    # Format timeline if provided
+    timeline = None
+    if data.get("timeline"):
+        lines = _LINE_RE.findall(data["timeline"])[:_MAX_LINES]
+        timeline = "\n".join(f"- **{line}**" for line in lines)
+    
+    # Format resolution if provided
+    resolution = None
+    if data.get("resolution"):
+        lines = _LINE_RE.findall(data["resolution"])[:_MAX_LINES]
+        resolution = "\n".join(f"{i+1}. {line}" for i, line in enumerate(lines))
+    
+    return {
+        "incident_name": incident,
+        "incident_date": date,
+        "duration": duration,
+        "impact": impact,
+        "root_cause": root_cause,
+        "timeline": timeline,
+        "resolution": resolution,
+    }
+
+def _request_kwargs():
+    """Validate the request body and map it onto generate_postmortem arguments."""
+    data = _VALIDATE(request.get_json(silent=True, cache=False))
+    for name, value in data.items():
+        if not isinstance(value, str):
+            continue
+        if len(value) > _MAX_FIELD:
+            abort(413, description=f"Fields are limited to {_MAX_FIELD} characters")
+        # JSON allows lone surrogate escapes such as "\ud800", which cannot be
+        # encoded in the UTF-8 response; reject them here rather than mid-response
+        try:
+            value.encode("utf-8")
+        except UnicodeEncodeError:
+            raise fastjsonschema.JsonSchemaValueException(
+                f"data.{name} must be valid Unicode text", value=value, name=f"data.{name}"
+            )
+    return _postmortem_kwargs(data)
+
+@app.errorhandler(413)
+def too_large(e):
+    message = e.description
+    # Werkzeug raises it with its stock description when the body is too big
+    if message == RequestEntityTooLarge.description:
+        message = f"Request body is limited to {app.config['MAX_CONTENT_LENGTH']} bytes"
+    return jsonify({"error": message}), 413
 
 @app.route("/generate", methods=["POST"])
 def generate():
     try:
-        data = request.json
-        
-        # Format timeline if provided
-        timeline = None
-        if data.get("timeline"):
-            lines = [line.strip() for line in data["timeline"].split("\n") if line.strip()]
-            timeline = "\n".join(f"- **{line}**" for line in lines)
-        
-        # Format resolution if provided
-        resolution = None
-        if data.get("resolution"):
-            lines = [line.strip() for line in data["resolution"].split("\n") if line.strip()]
-            resolution = "\n".join(f"{i+1}. {line}" for i, line in enumerate(lines))
-        
-        postmortem = generate_postmortem(
-            incident_name=data["incident"],
-            incident_date=data["date"],
-            duration=data["duration"],
-            impact=data["impact"],
-            root_cause=data["rootCause"],
-            timeline=timeline,
-            resolution=resolution
-        )
+        kwargs = _request_kwargs()
+    except fastjsonschema.JsonSchemaException as e:
+        return jsonify({"error": e.message}), 400
+    
+    try:
+        postmortem = generate_postmortem(**kwargs)
         
-        return jsonify({"postmortem": postmortem})
+        return Response(orjson.dumps({"postmortem": postmortem}), mimetype="application/json")
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/generate.md", methods=["POST"])
+def generate_markdown():
+    """Stream the post-mortem as raw Markdown, one section at a time."""
+    try:
+        kwargs = _request_kwargs()
+    except fastjsonschema.JsonSchemaException as e:
+        return jsonify({"error": e.message}), 400
+    
+    try:
+        # iter_postmortem prepares everything up front, so rendering errors
+        # surface here instead of after the streamed response has started
+        sections = iter_postmortem(**kwargs)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    return Response(sections, mimetype="text/markdown")
+
 if __name__ == "__main__":
-    app.run(debug=True, port=5001)
+    # Debugger and reloader are opt-in via FLASK_DEBUG=1, which app.run reads.
+    # For production, serve app:app with a WSGI server (see README).
+    app.run(port=5001)
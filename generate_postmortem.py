@@ -5,79 +5,43 @@ Incident Post-Mortem Template Generator
 Generates structured post-mortem documents from incident information.
 """
 
-import argparse
+import re
+import string
 from datetime import datetime
-from typing import Optional, Dict
-from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Sequence, Tuple
 
 
-def generate_postmortem(
-    incident_name: str,
-    incident_date: str,
-    duration: str,
-    impact: str,
-    root_cause: str,
-    timeline: Optional[str] = None,
-    resolution: Optional[str] = None,
-    action_items: Optional[list] = None
-) -> str:
-    """
-    Generate a post-mortem document from incident details.
-    
-    Args:
-        incident_name: Name/title of the incident
-        incident_date: Date of the incident (YYYY-MM-DD)
-        duration: How long the incident lasted
-        impact: Description of the impact
-        root_cause: Root cause analysis
-        timeline: Optional timeline of events
-        resolution: Optional resolution steps
-        action_items: Optional list of action items
-    
-    Returns:
-        Formatted Markdown post-mortem document
-    """
-    
-    # Parse date
-    try:
-        date_obj = datetime.strptime(incident_date, "%Y-%m-%d")
-        formatted_date = date_obj.strftime("%B %d, %Y")
-    except:
-        formatted_date = incident_date
-    
-    # Generate timeline if not provided
-    if not timeline:
-        timeline = f"""
-- **{incident_date} {datetime.now().strftime('%H:%M')} UTC**: Incident detected
-- **{incident_date} {datetime.now().strftime('%H:%M')} UTC**: Investigation started
-- **{incident_date} {datetime.now().strftime('%H:%M')} UTC**: Root cause identified
-- **{incident_date} {datetime.now().strftime('%H:%M')} UTC**: Incident resolved
-"""
-    
-    # Generate resolution if not provided
-    if not resolution:
-        resolution = """
-1. Immediate mitigation steps taken
-2. Root cause addressed
-3. System restored to normal operation
-4. Monitoring verified
-"""
-    
-    # Default action items if not provided
-    if not action_items:
-        action_items = [
-            "Review and update monitoring alerts",
-            "Document lessons learned",
-            "Update runbooks if applicable",
-            "Schedule follow-up review meeting"
-        ]
-    
-    postmortem = f"""# Post-Mortem: {incident_name}
+# Shape emitted by <input type="date">; matching it lets us skip strptime
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# Largest combined free-text input, in characters, that generate_postmortem caches
+_CACHE_MAX_INPUT = 4096
+
+# English month names for "%B %d, %Y" without going through strftime/locale
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+# Used when the caller supplies no action items; a tuple so it can be cached
+_DEFAULT_ACTIONS = (
+    "Review and update monitoring alerts",
+    "Document lessons learned",
+    "Update runbooks if applicable",
+    "Schedule follow-up review meeting",
+)
+
+# One row of the Action Items table
+_ACTION_ROW = "| {} | [Owner] | [Due Date] | Open | [Notes] |"
+
+# Placeholders are plain {name} fields filled from _postmortem_context.
+_TEMPLATE = """# Post-Mortem: {incident_name}
 
 **Date:** {formatted_date}  
 **Duration:** {duration}  
 **Status:** Resolved  
-**Generated:** {datetime.now().strftime("%B %d, %Y at %H:%M UTC")}
+**Generated:** {generated}
 
 ---
 
@@ -94,7 +58,7 @@ This document outlines the timeline, root cause analysis, and preventive measure
 
 ## Timeline
 
-{timeline.strip()}
+{timeline}
 
 ---
 
@@ -145,7 +109,7 @@ This document outlines the timeline, root cause analysis, and preventive measure
 ## Resolution
 
 ### Immediate Actions Taken
-{resolution.strip()}
+{resolution}
 
 ### Resolution Steps
 1. [Step 1]
@@ -191,12 +155,8 @@ This document outlines the timeline, root cause analysis, and preventive measure
 
 | Item | Owner | Due Date | Status | Notes |
 |------|-------|----------|--------|-------|
-"""
-    
-    for i, item in enumerate(action_items, 1):
-        postmortem += f"| {item} | [Owner] | [Due Date] | Open | [Notes] |\n"
-    
-    postmortem += f"""
+{rows}
+
 ---
 
 ## Lessons Learned
@@ -234,13 +194,233 @@ This document outlines the timeline, root cause analysis, and preventive measure
 ---
 
 *This post-mortem was generated using the Post-Mortem Template Generator. Please review and customize as needed.*
+"""
+
+# The same template cut after each horizontal rule, for iter_postmortem
+_SECTIONS = tuple(re.split(r"(?<=\n---\n)", _TEMPLATE))
+
+
+def _split_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Pre-parse a template into (literal text, field name or None) pairs."""
+    return tuple(
+        (literal, field) for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+
+# Parsed once here so rendering never re-scans the template text
+_CHUNKS = _split_template(_TEMPLATE)
+_SECTION_CHUNKS = tuple(_split_template(section) for section in _SECTIONS)
+
+
+def _fill(chunks: Tuple[Tuple[str, Optional[str]], ...], context: Dict[str, str]) -> str:
+    """Render pre-parsed template chunks with values from context."""
+    parts = []
+    for literal, field in chunks:
+        parts.append(literal)
+        if field is not None:
+            parts.append(context[field])
+    return "".join(parts)
+
+
+def generate_postmortem(
+    incident_name: str,
+    incident_date: str,
+    duration: str,
+    impact: str,
+    root_cause: str,
+    timeline: Optional[str] = None,
+    resolution: Optional[str] = None,
+    action_items: Optional[Sequence[str]] = None
+) -> str:
+    """
+    Generate a post-mortem document from incident details.
+    
+    Args:
+        incident_name: Name/title of the incident
+        incident_date: Date of the incident (YYYY-MM-DD)
+        duration: How long the incident lasted
+        impact: Description of the impact
+        root_cause: Root cause analysis
+        timeline: Optional timeline of events
+        resolution: Optional resolution steps
+        action_items: Optional sequence of action items
+    
+    Returns:
+        Formatted Markdown post-mortem document
+    """
+    
+    args = _postmortem_args(
+        incident_name, incident_date, duration, impact, root_cause,
+        timeline, resolution, action_items,
+    )
+    
+    # Only small inputs are worth caching; large ones would pin big strings
+    size = sum(len(text) for text in (impact, root_cause, timeline, resolution) if text)
+    size += sum(map(len, action_items or ()))
+    render = _render_postmortem_cached if size <= _CACHE_MAX_INPUT else _render_postmortem
+    
+    return render(*args)
+
+
+def iter_postmortem(
+    incident_name: str,
+    incident_date: str,
+    duration: str,
+    impact: str,
+    root_cause: str,
+    timeline: Optional[str] = None,
+    resolution: Optional[str] = None,
+    action_items: Optional[Sequence[str]] = None
+) -> Iterator[str]:
+    """
+    Return an iterator over the post-mortem document, one section at a time.
+    
+    Takes the same arguments as generate_postmortem; joining the sections
+    produces the same document. All inputs are processed before this returns,
+    so any error is raised here rather than while iterating.
+    """
+    
+    context = _postmortem_context(*_postmortem_args(
+        incident_name, incident_date, duration, impact, root_cause,
+        timeline, resolution, action_items,
+    ))
+    return (_fill(chunks, context) for chunks in _SECTION_CHUNKS)
+
+
+def _postmortem_args(
+    incident_name: str,
+    incident_date: str,
+    duration: str,
+    impact: str,
+    root_cause: str,
+    timeline: Optional[str],
+    resolution: Optional[str],
+    action_items: Optional[Sequence[str]]
+) -> tuple:
+    """
+    Prepare the public arguments for rendering.
+    
+    Normalises action items and reads the clock, returning the positional
+    arguments of _render_postmortem and _postmortem_context.
+    """
+    
+    # Snapshot the clock once so every timestamp in the document agrees
+    now = datetime.now()
+    
+    return (
+        incident_name,
+        incident_date,
+        duration,
+        impact,
+        root_cause,
+        timeline,
+        resolution,
+        tuple(action_items) if action_items else _DEFAULT_ACTIONS,
+        now.strftime("%H:%M"),
+        now.strftime("%B %d, %Y at %H:%M UTC"),
+    )
+
+
+def _render_postmortem(
+    incident_name: str,
+    incident_date: str,
+    duration: str,
+    impact: str,
+    root_cause: str,
+    timeline: Optional[str],
+    resolution: Optional[str],
+    action_items: Tuple[str, ...],
+    now_hm: str,
+    generated: str
+) -> str:
+    """Render the whole document for generate_postmortem."""
+    return _fill(_CHUNKS, _postmortem_context(
+        incident_name,
+        incident_date,
+        duration,
+        impact,
+        root_cause,
+        timeline,
+        resolution,
+        action_items,
+        now_hm,
+        generated,
+    ))
+
+
+# The arguments are pure (the clock is passed in at minute resolution), so a
+# resubmission of the same small incident within a minute is a cache hit
+_render_postmortem_cached = lru_cache(maxsize=64)(_render_postmortem)
+
+
+@lru_cache(maxsize=64)
+def _format_date(incident_date: str) -> str:
+    """Format a YYYY-MM-DD date as "Month DD, YYYY", or return it unchanged."""
+    try:
+        if _DATE_RE.fullmatch(incident_date):
+            date_obj = datetime(
+                int(incident_date[:4]), int(incident_date[5:7]), int(incident_date[8:10])
+            )
+        else:
+            date_obj = datetime.strptime(incident_date, "%Y-%m-%d")
+    except ValueError:
+        return incident_date
+    return f"{_MONTHS[date_obj.month - 1]} {date_obj.day:02d}, {date_obj.year}"
+
+
+def _postmortem_context(
+    incident_name: str,
+    incident_date: str,
+    duration: str,
+    impact: str,
+    root_cause: str,
+    timeline: Optional[str],
+    resolution: Optional[str],
+    action_items: Tuple[str, ...],
+    now_hm: str,
+    generated: str
+) -> Dict[str, str]:
+    """Build the placeholder values for _TEMPLATE."""
+    
+    formatted_date = _format_date(incident_date)
+    
+    # Generate timeline if not provided
+    if not timeline:
+        timeline = f"""
+- **{incident_date} {now_hm} UTC**: Incident detected
+- **{incident_date} {now_hm} UTC**: Investigation started
+- **{incident_date} {now_hm} UTC**: Root cause identified
+- **{incident_date} {now_hm} UTC**: Incident resolved
+"""
+    
+    # Generate resolution if not provided
+    if not resolution:
+        resolution = """
+1. Immediate mitigation steps taken
+2. Root cause addressed
+3. System restored to normal operation
+4. Monitoring verified
 """
     
-    return postmortem
+    rows = "\n".join(map(_ACTION_ROW.format, action_items))
+
+    return {
+        "incident_name": incident_name,
+        "formatted_date": formatted_date,
+        "duration": duration,
+        "impact": impact,
+        "root_cause": root_cause,
+        "timeline": timeline.strip(),
+        "resolution": resolution.strip(),
+        "rows": rows,
+        "generated": generated,
+    }
 
 
 def interactive_mode():
     """Interactive CLI mode for gathering incident information."""
+    from pathlib import Path
+    
     print("=" * 60)
     print("Incident Post-Mortem Generator")
     print("=" * 60)
@@ -328,6 +508,10 @@ def interactive_mode():
 
 
 def main():
+    # CLI-only imports, kept out of the web app's import path
+    import argparse
+    from pathlib import Path
+    
     parser = argparse.ArgumentParser(description="Generate incident post-mortem documents")
     parser.add_argument("--incident", help="Incident name/title")
     parser.add_argument("--date", help="Incident date (YYYY-MM-DD)")
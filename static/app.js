@@ -0,0 +1,55 @@
+// Set today's date as default
+document.getElementById('date').valueAsDate = new Date();
+
+let currentPostmortem = '';
+
+document.getElementById('postmortemForm').addEventListener('submit', async (e) => {
+  e.preventDefault();
+
+  const formData = {
+    incident: document.getElementById('incident').value,
+    date: document.getElementById('date').value,
+    duration: document.getElementById('duration').value,
+    impact: document.getElementById('impact').value,
+    rootCause: document.getElementById('rootCause').value,
+    timeline: document.getElementById('timeline').value,
+    resolution: document.getElementById('resolution').value
+  };
+
+  try {
+    const response = await fetch('/generate', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(formData)
+    });
+
+    const data = await response.json();
+
+    if (data.error) {
+      alert('Error: ' + data.error);
+    } else {
+      currentPostmortem = data.postmortem;
+      document.getElementById('previewContent').textContent = data.postmortem;
+      document.getElementById('preview').style.display = 'block';
+      document.getElementById('downloadBtn').style.display = 'inline-block';
+    }
+  } catch (err) {
+    alert('Error: ' + err.message);
+  }
+});
+
+document.getElementById('downloadBtn').addEventListener('click', () => {
+  if (!currentPostmortem) return;
+
+  const blob = new Blob([currentPostmortem], { type: 'text/markdown' });
+  const url = URL.createObjectURL(blob);
+  const a = document.createElement('a');
+  a.href = url;
+  a.download = `postmortem_${document.getElementById('date').value}_${document.getElementById('incident').value.toLowerCase().replace(/ /g, '_')}.md`;
+  document.body.appendChild(a);
+  a.click();
+  document.body.removeChild(a);
+  URL.revokeObjectURL(url);
+});
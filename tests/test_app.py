@@ -0,0 +1,251 @@
+"""Tests for the Flask web interface."""
+
+import gzip
+import mimetypes
+import os
+import re
+import sys
+import time
+
+import brotli
+import flask_compress.flask_compress
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import _LINE_RE, app
+
+
+def _client():
+    return app.test_client()
+
+
+def test_index_serves_form():
+    response = _client().get("/")
+    assert response.status_code == 200
+    assert response.mimetype == "text/html"
+    assert b'id="postmortemForm"' in response.data
+    assert response.headers["Content-Length"] == str(len(response.data))
+
+
+def test_index_honours_etag():
+    client = _client()
+    etag = client.get("/").headers["ETag"]
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_index_links_versioned_static_assets():
+    client = _client()
+    page = client.get("/").get_data(as_text=True)
+    urls = re.findall(r'(?:href|src)="(/static/[^"]+\?v=[0-9a-f]+)"', page)
+    assert len(urls) == 2
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.cache_control.max_age == 31536000
+
+
+def _payload(**overrides):
+    payload = {
+        "incident": "API Outage",
+        "date": "2024-01-15",
+        "duration": "2 hours",
+        "impact": "Checkout unavailable",
+        "rootCause": "Connection pool exhaustion",
+        "timeline": "",
+        "resolution": "",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_generate_formats_timeline_and_resolution_lines():
+    response = _client().post(
+        "/generate",
+        json=_payload(
+            timeline="  10:00 - detected \n\n\t10:15 - resolved\r\n",
+            resolution="Restart pool\n   \nRaise limit",
+        ),
+    )
+    assert response.status_code == 200
+    doc = response.get_json()["postmortem"]
+    assert "- **10:00 - detected**\n- **10:15 - resolved**" in doc
+    assert "1. Restart pool\n2. Raise limit" in doc
+
+
+def test_line_extraction_matches_strip_and_stays_linear():
+    def expected(text):
+        return [line.strip() for line in text.split("\n") if line.strip()]
+
+    samples = [
+        "",
+        " \t\r\n\x0b\x85\u3000\n",
+        "a\r\n  b  c \n\n\x1cd\x1c",
+        "a" + " " * 20000 + "b",
+        "\n" * 60000,
+        " " * 60000,
+        "x \n" * 20000,
+    ]
+    start = time.perf_counter()
+    for text in samples:
+        assert _LINE_RE.findall(text) == expected(text)
+    assert time.perf_counter() - start < 1
+
+
+def test_generate_handles_pathological_timeline_quickly():
+    start = time.perf_counter()
+    response = _client().post("/generate", json=_payload(timeline="\n" * 65536))
+    assert response.status_code == 200
+    assert time.perf_counter() - start < 2
+
+def test_generate_returns_utf8_json():
+    response = _client().post("/generate", json=_payload(incident="Café outage ✓"))
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert "Café outage ✓".encode("utf-8") in response.data
+    assert response.get_json()["postmortem"].startswith("# Post-Mortem: Café outage ✓")
+
+
+def test_generate_markdown_streams_same_document():
+    client = _client()
+    payload = _payload(timeline="10:00 - detected", resolution="Restart pool")
+    expected = client.post("/generate", json=payload).get_json()["postmortem"]
+    response = client.post("/generate.md", json=payload)
+    assert response.status_code == 200
+    assert response.mimetype == "text/markdown"
+    assert response.is_streamed
+    assert response.get_data(as_text=True) == expected
+
+
+def test_generate_response_is_compressed_when_accepted():
+    response = _client().post(
+        "/generate", json=_payload(), headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    body = orjson.loads(gzip.decompress(response.data))
+    assert body["postmortem"].startswith("# Post-Mortem: API Outage")
+
+
+def test_missing_required_field_is_rejected():
+    client = _client()
+    payload = _payload()
+    del payload["rootCause"]
+    for url in ("/generate", "/generate.md"):
+        response = client.post(url, json=payload)
+        assert response.status_code == 400
+        assert "rootCause" in response.get_json()["error"]
+
+
+def test_invalid_payload_is_rejected():
+    client = _client()
+    for kwargs in ({"data": "not json"}, {"json": [1, 2]}, {"json": _payload(impact=42)}):
+        response = client.post("/generate", **kwargs)
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+
+def test_oversized_field_is_rejected():
+    client = _client()
+    for payload in (_payload(timeline="x" * (64 * 1024 + 1)), _payload(impact="x" * (1024 * 1024))):
+        for url in ("/generate", "/generate.md"):
+            response = client.post(url, json=payload)
+            assert response.status_code == 413
+            assert "Fields are limited" in response.get_json()["error"]
+
+
+def test_oversized_body_is_rejected():
+    body = b'{"impact": "' + b"x" * app.config["MAX_CONTENT_LENGTH"] + b'"}'
+    response = _client().post("/generate", data=body, content_type="application/json")
+    assert response.status_code == 413
+    assert "Request body is limited" in response.get_json()["error"]
+
+
+def test_fields_at_limit_are_accepted_in_any_encoding_and_quickly():
+    limit = 64 * 1024
+    payload = _payload(
+        impact="\U0001f600" * limit,
+        rootCause="a" + " " * (limit - 2) + "b",
+        timeline="\n" * limit,
+        resolution=" \t\n" * (limit // 3),
+    )
+    start = time.perf_counter()
+    for url in ("/generate", "/generate.md"):
+        response = _client().post(url, json=payload)
+        assert response.status_code == 200
+        response.get_data()
+    assert time.perf_counter() - start < 2
+
+
+def test_timeline_lines_are_capped():
+    response = _client().post("/generate", json=_payload(timeline="event\n" * 2000))
+    assert response.status_code == 200
+    assert response.get_json()["postmortem"].count("- **event**") == 500
+
+
+def test_lone_surrogate_is_rejected():
+    body = orjson.dumps(_payload()).replace(b'"API Outage"', b'"bad \\ud800"')
+    for url in ("/generate", "/generate.md"):
+        response = _client().post(url, data=body, content_type="application/json")
+        assert response.status_code == 400
+        assert "data.incident" in response.get_json()["error"]
+
+
+def test_streamed_responses_are_gzipped_when_accepted():
+    client = _client()
+    headers = {"Accept-Encoding": "gzip"}
+    response = client.post("/generate.md", json=_payload(), headers=headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).startswith(b"# Post-Mortem: API Outage")
+
+    page = client.get("/").get_data(as_text=True)
+    url = re.search(r'href="(/static/app\.css[^"]*)"', page).group(1)
+    response = client.get(url, headers=headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert b".container" in gzip.decompress(response.data)
+
+
+def test_compressed_index_honours_etag():
+    client = _client()
+    for encoding in ("br", "gzip"):
+        headers = {"Accept-Encoding": encoding}
+        first = client.get("/", headers=headers)
+        assert first.headers["Content-Encoding"] == encoding
+        response = client.get("/", headers={**headers, "If-None-Match": first.headers["ETag"]})
+        assert response.status_code == 304
+
+
+def test_compressed_markdown_is_still_streamed():
+    response = _client().post("/generate.md", json=_payload(), headers={"Accept-Encoding": "br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.is_streamed
+    assert "Content-Length" not in response.headers
+
+
+def test_javascript_is_compressed_under_either_mimetype(monkeypatch):
+    client = _client()
+    page = client.get("/").get_data(as_text=True)
+    url = re.search(r'src="(/static/app\.js[^"]*)"', page).group(1)
+    for mimetype in ("text/javascript", "application/javascript"):
+        monkeypatch.setitem(mimetypes.types_map, ".js", mimetype)
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.mimetype == mimetype
+        assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_index_is_served_from_precompressed_variants(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("index page was compressed per request")
+
+    monkeypatch.setattr(flask_compress.flask_compress, "_compress_data", fail)
+    client = _client()
+    plain = client.get("/").data
+    br = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+    assert br.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(br.data) == plain
+    gz = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz.data) == plain
+    assert gz.headers["Vary"] == "Accept-Encoding"
+    assert gz.headers["Content-Length"] == str(len(gz.data))
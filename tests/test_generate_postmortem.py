@@ -3,9 +3,16 @@
 import os
 import sys
 
+import pytest
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from generate_postmortem import generate_postmortem
+from generate_postmortem import (
+    _format_date,
+    _render_postmortem_cached,
+    generate_postmortem,
+    iter_postmortem,
+)
 
 
 def _doc():
@@ -63,3 +70,69 @@ def test_unparseable_date_passed_through():
         root_cause="r",
     )
     assert "last Tuesday" in doc
+
+
+def test_braces_in_input_are_not_interpreted():
+    doc = generate_postmortem(
+        incident_name="Config {env} leak",
+        incident_date="2024-01-15",
+        duration="1h",
+        impact="{impact}",
+        root_cause="r",
+        action_items=["Rotate {secret}"],
+    )
+    assert "# Post-Mortem: Config {env} leak" in doc
+    assert "| Rotate {secret} | [Owner] | [Due Date] | Open | [Notes] |" in doc
+
+
+def test_invalid_calendar_date_passed_through():
+    doc = generate_postmortem(
+        incident_name="X",
+        incident_date="2024-02-30",
+        duration="1h",
+        impact="i",
+        root_cause="r",
+    )
+    assert "**Date:** 2024-02-30" in doc
+
+
+def test_render_is_cached_for_identical_inputs():
+    args = ("X", "2024-01-15", "1h", "i", "r", None, None, ("a",), "10:00", "now")
+    assert _render_postmortem_cached(*args) is _render_postmortem_cached(*args)
+
+
+def test_large_inputs_bypass_the_cache():
+    before = _render_postmortem_cached.cache_info()
+    doc = generate_postmortem(
+        incident_name="X",
+        incident_date="2024-01-15",
+        duration="1h",
+        impact="i" * 10000,
+        root_cause="r",
+    )
+    after = _render_postmortem_cached.cache_info()
+    assert "i" * 10000 in doc
+    assert (after.hits, after.misses) == (before.hits, before.misses)
+
+
+def test_action_items_accept_list_or_tuple():
+    kwargs = dict(incident_name="X", incident_date="2024-01-15", duration="1h", impact="i", root_cause="r")
+    assert generate_postmortem(action_items=["a"], **kwargs) == generate_postmortem(action_items=("a",), **kwargs)
+
+
+def test_iter_postmortem_joins_to_full_document():
+    kwargs = dict(incident_name="X", incident_date="2024-01-15", duration="1h", impact="i", root_cause="r")
+    sections = list(iter_postmortem(**kwargs))
+    assert len(sections) > 1
+    assert "".join(sections) == generate_postmortem(**kwargs)
+
+
+def test_format_date_variants():
+    assert _format_date("2024-01-05") == "January 05, 2024"
+    assert _format_date("2024-1-5") == "January 05, 2024"
+    assert _format_date("2024-13-01") == "2024-13-01"
+
+
+def test_iter_postmortem_raises_before_iteration():
+    with pytest.raises(TypeError):
+        iter_postmortem(incident_name="X", incident_date=None, duration="1h", impact="i", root_cause="r")